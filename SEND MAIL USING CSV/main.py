@@ -1,19 +1,26 @@
 import gspread
 import qrcode
-import random
 import string
+import functools
+from io import BytesIO
+try:
+    import segno  # several times faster than python-qrcode at encoding
+except ImportError:
+    segno = None
+import numpy as np
+from collections import deque
 from PIL import Image
 import os
 import time
 import csv
+import sqlite3
 from tqdm import tqdm
 import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.base import MIMEBase
-from email import encoders
+import mimetypes
+from email.message import EmailMessage
 from dotenv import load_dotenv
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
 
 # Load environment variables
 load_dotenv()
@@ -24,101 +31,180 @@ SMTP_PORT = int(os.getenv("SMTP_PORT", 587))
 EMAIL_USER = os.getenv("EMAIL_USER")
 EMAIL_PASSWORD = os.getenv("EMAIL_PASSWORD")
 
-def normalize_columns(row):
-    """
-    Normalize column names to match expected headers.
-    """
-    normalized_row = {}
-    column_mapping = {
-        'name': 'Name',
-        'id': 'Roll-No',
-        'email': 'EMAIL',
-    }
-
-    for key, value in row.items():
-        normalized_key = column_mapping.get(key.lower(), key)  # Normalize or keep as-is
-        normalized_row[normalized_key] = value
-
-    return normalized_row
+_COLUMN_MAPPING = {
+    'name': 'Name',
+    'id': 'Roll-No',
+    'email': 'EMAIL',
+}
+
+def normalize_columns(row, _mapping=_COLUMN_MAPPING):
+    """Normalize column names to match expected headers."""
+    # Single dict comprehension with the mapping bound locally — no dict
+    # rebuild or method lookups per row.
+    return {_mapping.get(key.lower(), key): value for key, value in row.items()}
+
+# Ticket keys live in a small SQLite database: appends are indexed
+# INSERT OR IGNORE statements instead of rewriting/re-reading a growing
+# CSV, and the primary key enforces uniqueness on disk.
+KEY_DB_FILE = "tickets.db"
+_key_db = None
+
+def _get_key_db():
+    global _key_db
+    if _key_db is None:
+        _key_db = sqlite3.connect(KEY_DB_FILE)
+        _key_db.execute("CREATE TABLE IF NOT EXISTS keys (k TEXT PRIMARY KEY, ts TEXT)")
+        _key_db.commit()
+    return _key_db
 
 def load_ticket_keys(key_file):
-    """Load existing ticket keys from a CSV file."""
-    ticket_keys = set()
+    """Load existing ticket keys, importing any legacy CSV key file once."""
+    db = _get_key_db()
     if os.path.exists(key_file):
         with open(key_file, mode="r") as file:
             reader = csv.reader(file)
-            for row in reader:
-                ticket_keys.add(row[0])
-    return ticket_keys
+            db.executemany(
+                "INSERT OR IGNORE INTO keys (k, ts) VALUES (?, ?)",
+                ((row[0], row[1] if len(row) > 1 else "") for row in reader if row),
+            )
+        db.commit()
+    return {row[0] for row in db.execute("SELECT k FROM keys")}
 
 def save_ticket_key(key_file, ticket_number):
-    """Save a new ticket key to the CSV file with a timestamp."""
-    with open(key_file, mode="a", newline="") as file:
-        writer = csv.writer(file)
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        writer.writerow([ticket_number, timestamp])
+    """Save a new ticket key to the database with a timestamp."""
+    db = _get_key_db()
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    db.execute("INSERT OR IGNORE INTO keys (k, ts) VALUES (?, ?)", (ticket_number, timestamp))
+    db.commit()
+
+# Candidate ticket numbers are generated 256 at a time with one vectorized
+# NumPy draw (alphabet lookup on a random index matrix) instead of a
+# Python-level random.choices call per ticket.
+_TICKET_ALPHABET = np.frombuffer((string.ascii_uppercase + string.digits).encode(), dtype=np.uint8)
+_TICKET_NUMBER_POOL = deque()
+_TICKET_POOL_BATCH = 256
+
+def _refill_ticket_number_pool():
+    """Top up the candidate pool with one batched random draw."""
+    idx = np.random.randint(0, len(_TICKET_ALPHABET), size=(_TICKET_POOL_BATCH, 8))
+    # Reinterpret each 8-byte row as one S8 string and convert in bulk,
+    # instead of slicing and decoding row by row in Python.
+    _TICKET_NUMBER_POOL.extend(_TICKET_ALPHABET[idx].view('S8').ravel().astype(str).tolist())
 
 def generate_unique_ticket_number(existing_keys):
     """Generate a unique ticket number."""
     while True:
-        ticket_number = ''.join(random.choices(string.ascii_uppercase + string.digits, k=8))
+        if not _TICKET_NUMBER_POOL:
+            _refill_ticket_number_pool()
+        ticket_number = _TICKET_NUMBER_POOL.popleft()
         if ticket_number not in existing_keys:
             return ticket_number
 
-def generate_ticket_qr(row, template_id, template_folder, output_folder, existing_keys, key_file):
-    ticket_number = generate_unique_ticket_number(existing_keys)
-    qr_data = f"NAME: {row['Name']}, ROLL-NO: {row['Roll-No']}, EMAIL: {row['EMAIL']}, Ticket Number: {ticket_number}"
-    template_path = os.path.join(template_folder, f"{template_id}.png")
-
-    if not os.path.exists(template_path):
-        print(f"Template image not found for template ID: {template_id}")
-        return None, None
-
+@functools.lru_cache(maxsize=32)
+def _load_template(template_path):
+    """
+    Decode a template image once per path (per process). The PNG inflate
+    dominates per-ticket cost when many rows share a template, so callers
+    take a .copy() and draw on that.
+    """
     template_image = Image.open(template_path)
-    qr = qrcode.QRCode(
-        version=1,
-        error_correction=qrcode.constants.ERROR_CORRECT_L,
-        box_size=10,
-        border=4,
-    )
-    qr.add_data(qr_data)
-    qr.make(fit=True)
-    qr_image = qr.make_image(fill_color="black", back_color="white")
-    qr_image = qr_image.resize((150, 150))
+    template_image.load()
+    return template_image
+
+# Reusable fallback encoder: constructing a QRCode per ticket re-runs
+# the Reed-Solomon table setup, so one instance lives per process (each
+# pool worker gets its own) and clear() resets it between rows.
+_QR = qrcode.QRCode(
+    version=1,
+    error_correction=qrcode.constants.ERROR_CORRECT_L,
+    box_size=1,
+    border=2,
+)
+
+def _warm_render_worker(template_path):
+    """Pool initializer: decode the batch's template into this worker's cache."""
+    _load_template(template_path)
+
+def _render_ticket_image(row, ticket_number, template_path, output_path):
+    """
+    Render one ticket image (template + pasted QR) and save it.
+    Top-level and free of shared state so it can run in a worker process.
+    """
+    qr_data = f"NAME: {row['Name']}, ROLL-NO: {row['Roll-No']}, EMAIL: {row['EMAIL']}, Ticket Number: {ticket_number}"
+    template_image = _load_template(template_path).copy()
+    if segno is not None:
+        qr = segno.make(qr_data, error='l')
+        width, _ = qr.symbol_size(scale=1, border=2)
+        buffer = BytesIO()
+        qr.save(buffer, kind='png', scale=max(1, 150 // width), border=2)
+        qr_image = Image.open(buffer).convert('L')
+    else:
+        qr = _QR
+        qr.clear()
+        qr.version = 1  # restart the fit search from the smallest version
+        qr.add_data(qr_data)
+        qr.make(fit=True)
+        # Upscale the module grid with integer nearest-neighbor repeats
+        # (one vectorized NumPy op) instead of qrcode's PIL image factory
+        # drawing a rectangle per module — same approach as the API.
+        matrix = np.array(qr.get_matrix(), dtype=np.uint8)  # border included
+        scale = max(1, 150 // matrix.shape[0])
+        pixels = ((1 - matrix) * 255).repeat(scale, axis=0).repeat(scale, axis=1)
+        qr_image = Image.fromarray(pixels, mode='L')
     qr_position = (template_image.width - qr_image.width - 50, template_image.height - qr_image.height - 120)
     template_image.paste(qr_image, qr_position)
-    ticket_id = f"SAVISHKAARA2K25#{row['Roll-No']}_{ticket_number}.png"
-    output_path = os.path.join(output_folder, ticket_id)
-    template_image.save(output_path)
-
-    save_ticket_key(key_file, ticket_number)
-    return ticket_number, output_path
-
-def send_email_with_attachment(subject, recipient, body, attachment_path):
-    """Send an email with an attachment."""
+    # compress_level=1 encodes several times faster than the zlib default
+    # (6) for a modestly larger file; tickets are one-shot email
+    # attachments, not archives. Encoding into memory first turns the
+    # file write into a single os.write instead of Pillow's incremental
+    # flushes through the buffered file object.
+    buffer = BytesIO()
+    template_image.save(buffer, format="PNG", compress_level=1, optimize=False)
+    fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
     try:
-        # Setup the MIME
-        message = MIMEMultipart()
+        os.write(fd, buffer.getbuffer())
+    finally:
+        os.close(fd)
+    return output_path
+
+def _open_smtp_session():
+    """Connect, start TLS and log in once; caller owns the session."""
+    server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT)
+    server.starttls()
+    server.login(EMAIL_USER, EMAIL_PASSWORD)
+    return server
+
+def send_email_with_attachment(subject, recipient, body, attachment_path, server=None):
+    """
+    Send an email with an attachment. Pass an open SMTP session as
+    server to reuse it across a batch (the TLS handshake + login is the
+    expensive part); with no server a one-shot connection is made.
+    """
+    try:
+        # EmailMessage attaches bytes directly and streams the base64
+        # transfer encoding, instead of the MIMEMultipart/encode_base64
+        # path that rewraps the whole payload through an intermediate str.
+        message = EmailMessage()
         message['From'] = EMAIL_USER
         message['To'] = recipient
         message['Subject'] = subject
+        message.set_content(body)
 
-        # Attach the body with the msg instance
-        message.attach(MIMEText(body, 'plain'))
-
-        # Open the file to be sent
+        ctype, _ = mimetypes.guess_type(attachment_path)
+        maintype, subtype = (ctype or 'application/octet-stream').split('/', 1)
         with open(attachment_path, "rb") as attachment:
-            mime_base = MIMEBase('application', 'octet-stream')
-            mime_base.set_payload(attachment.read())
-            encoders.encode_base64(mime_base)
-            mime_base.add_header('Content-Disposition', f'attachment; filename={os.path.basename(attachment_path)}')
-            message.attach(mime_base)
-
-        # Connect to the server and send the email
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-            server.starttls()
-            server.login(EMAIL_USER, EMAIL_PASSWORD)
+            message.add_attachment(
+                attachment.read(),
+                maintype=maintype,
+                subtype=subtype,
+                filename=os.path.basename(attachment_path),
+            )
+
+        if server is not None:
             server.send_message(message)
+        else:
+            with _open_smtp_session() as one_shot:
+                one_shot.send_message(message)
 
         print(f"Email sent to {recipient} with attachment {attachment_path}")
 
@@ -126,50 +212,164 @@ def send_email_with_attachment(subject, recipient, body, attachment_path):
         print(f"Failed to send email to {recipient}: {e}")
 
 def is_valid_row(row):
-    """Check if all columns in the row have values."""
-    return all(value.strip() for value in row.values())
+    """Check that the required columns are present and non-empty."""
+    return all((row.get(key) or '').strip() for key in ('Name', 'Roll-No', 'EMAIL'))
+
+# Incremental fetch state per sheet URL: the header row plus how many
+# sheet rows have been downloaded, so polls after the first only pull
+# rows appended since. Edits to already-fetched rows are not re-read,
+# which matches how processed_ids treats rows as append-only anyway.
+_SHEET_FETCH_STATE = {}
+
+def _fetch_new_rows(sheet, sheet_url):
+    """
+    Return (rows, cursor): dict rows appended since the last committed
+    poll, plus the cursor to pass to _commit_sheet_cursor once they have
+    actually been processed. The cursor is NOT advanced here — if the
+    caller crashes mid-batch the same rows come back on the next poll
+    instead of being lost.
+    """
+    state = _SHEET_FETCH_STATE.get(sheet_url)
+    if state is None or not state["header"]:
+        values = sheet.get_all_values()
+        if not values:
+            _SHEET_FETCH_STATE[sheet_url] = {"header": [], "rows_seen": 0}
+            return [], 0
+        header = values[0]
+        # Only the header row counts as seen until the batch commits.
+        _SHEET_FETCH_STATE[sheet_url] = {"header": header, "rows_seen": 1}
+        data_rows = values[1:]
+        cursor = len(values)
+    else:
+        header = state["header"]
+        data_rows = sheet.get(f"A{state['rows_seen'] + 1}:Z")
+        cursor = state["rows_seen"] + len(data_rows)
+    rows = [
+        dict(zip(header, row + [''] * (len(header) - len(row))))
+        for row in data_rows
+    ]
+    return rows, cursor
+
+def _commit_sheet_cursor(sheet_url, cursor):
+    """Mark rows up to cursor as processed so the next poll skips them."""
+    state = _SHEET_FETCH_STATE.get(sheet_url)
+    if state is not None:
+        state["rows_seen"] = max(state["rows_seen"], cursor)
 
 def process_sheet(sheet_url, template_id, processed_ids, output_sheet, template_folder, output_folder, existing_keys, key_file):
     gc = gspread.service_account(filename="service_account.json")
     sheet = gc.open_by_url(sheet_url).sheet1
 
-    rows = sheet.get_all_records()
-    if not rows:
-        return
+    # Every row in a sheet shares this one template, so the batch is
+    # already grouped by template-id; the decode itself is amortized by
+    # the _load_template cache inside each render worker. Checked before
+    # fetching so a missing template does not burn through sheet rows.
+    # EAFP: try opening the file rather than stat-ing it first.
+    template_path = os.path.join(template_folder, f"{template_id}.png")
+    try:
+        with open(template_path, "rb"):
+            pass
+    except FileNotFoundError:
+        print(f"Template image not found for template ID: {template_id}")
+        return 0
 
-    new_tickets_generated = 0
+    rows, cursor = _fetch_new_rows(sheet, sheet_url)
+    if not rows:
+        return 0
 
+    # First pass: validate rows and assign ticket numbers serially (the
+    # key set is shared state), collecting the render work.
+    pending = []
     for row in rows:
         row = normalize_columns(row)
         if not is_valid_row(row):
             print(f"Skipping row with missing values: {row}")
             continue
 
-        if 'Name' not in row or 'Roll-No' not in row or 'EMAIL' not in row:
-            print(f"Skipping invalid row: {row}")
-            continue
-
         unique_key = f"{template_id}_{row['Name']}_{row['Roll-No']}_{row['EMAIL']}"
         if unique_key in processed_ids:
             continue
 
-        ticket_number, ticket_path = generate_ticket_qr(row, template_id, template_folder, output_folder, existing_keys, key_file)
-        if ticket_number and ticket_path:
+        ticket_number = generate_unique_ticket_number(existing_keys)
+        existing_keys.add(ticket_number)
+        ticket_id = f"SAVISHKAARA2K25#{row['Roll-No']}_{ticket_number}.png"
+        pending.append((row, unique_key, ticket_number, os.path.join(output_folder, ticket_id)))
+
+    if not pending:
+        # All rows were invalid or already processed — that still counts
+        # as handled, so the cursor moves past them.
+        _commit_sheet_cursor(sheet_url, cursor)
+        print(f"No new rows to process for template ID: {template_id}.")
+        return 0
+
+    # Rendering is CPU-bound (PNG encode) and independent per ticket, so it
+    # fans out across all cores; keys, sheet rows and emails stay serial.
+    # chunksize=16 amortizes pickling overhead across batches of rows.
+    # The initializer decodes the template once per worker at spawn, so no
+    # render pays the first-ticket decode. Workers only touch pixels —
+    # the gspread client and SMTP sessions stay in the parent on purpose,
+    # since neither handle survives a fork cleanly and the serial phase
+    # is where they are used.
+    with ProcessPoolExecutor(
+        max_workers=os.cpu_count(),
+        initializer=_warm_render_worker,
+        initargs=(template_path,),
+    ) as executor:
+        list(tqdm(
+            executor.map(
+                _render_ticket_image,
+                [item[0] for item in pending],
+                [item[2] for item in pending],
+                [template_path] * len(pending),
+                [item[3] for item in pending],
+                chunksize=16,
+            ),
+            total=len(pending),
+            desc=f"Rendering {template_id}",
+        ))
+
+    # One authenticated SMTP session for the whole batch; each send is
+    # then a single MAIL/RCPT/DATA exchange instead of paying the TLS
+    # handshake + login per recipient. If the connect fails the sends
+    # fall back to one-shot connections.
+    smtp_session = None
+    try:
+        smtp_session = _open_smtp_session()
+    except Exception as e:
+        print(f"Could not open shared SMTP session, sending individually: {e}")
+
+    new_rows = []
+    try:
+        for row, unique_key, ticket_number, ticket_path in pending:
+            save_ticket_key(key_file, ticket_number)
             processed_ids.add(unique_key)
-            existing_keys.add(ticket_number)
-            output_sheet.append_row([row['Name'], row['Roll-No'], row['EMAIL'], ticket_number, os.path.basename(ticket_path)])
+            new_rows.append([row['Name'], row['Roll-No'], row['EMAIL'], ticket_number, os.path.basename(ticket_path)])
             send_email_with_attachment(
                 f"Your {template_id} Event Ticket",
                 row['EMAIL'],
                 f"Dear {row['Name']},\n\nPlease find your ticket attached.\n\nThank you for registering!",
-                ticket_path
+                ticket_path,
+                server=smtp_session
             )
-            new_tickets_generated += 1
-
-    if new_tickets_generated > 0:
-        print(f"Generated {new_tickets_generated} new tickets for template ID: {template_id}")
-    else:
-        print(f"No new rows to process for template ID: {template_id}.")
+    finally:
+        if smtp_session is not None:
+            try:
+                smtp_session.quit()
+            except Exception:
+                pass
+
+    # One append_rows call per sheet pass instead of one HTTP round-trip
+    # (and one write-quota unit) per ticket.
+    if new_rows:
+        output_sheet.append_rows(new_rows, value_input_option='RAW')
+
+    # Only now is the batch durable (keys saved, emails sent, output sheet
+    # appended); an exception above leaves the cursor behind so the same
+    # rows are fetched again on the next poll.
+    _commit_sheet_cursor(sheet_url, cursor)
+
+    print(f"Generated {len(pending)} new tickets for template ID: {template_id}")
+    return len(pending)
 
 def main():
     # CSV containing template IDs and sheet URLs
@@ -197,18 +397,35 @@ def main():
         sheet_configs = list(reader)
 
     print("Monitoring multiple templates for new data...")
+    # Adaptive polling: a sheet that produced nothing has its interval
+    # doubled (capped at MAX_POLL) and is skipped until it comes due, so
+    # idle sheets stop burning Sheets API quota; any new ticket resets the
+    # sheet back to the fast MIN_POLL cadence.
+    MIN_POLL, MAX_POLL = 10, 300
+    poll_interval = {}
+    next_poll_at = {}
     while True:
         try:
+            now = time.monotonic()
             for config in sheet_configs:
                 sheet_url = config.get("sheet_url")
                 template_id = config.get("template-id")
                 if not sheet_url or not template_id:
                     print(f"Invalid configuration: {config}")
                     continue
+                if now < next_poll_at.get(sheet_url, 0):
+                    continue
 
-                process_sheet(sheet_url, template_id, processed_ids, output_sheet, template_folder, output_folder, existing_keys, key_file)
+                produced = process_sheet(sheet_url, template_id, processed_ids, output_sheet, template_folder, output_folder, existing_keys, key_file)
+                if produced:
+                    poll_interval[sheet_url] = MIN_POLL
+                else:
+                    poll_interval[sheet_url] = min(MAX_POLL, poll_interval.get(sheet_url, MIN_POLL) * 2)
+                next_poll_at[sheet_url] = time.monotonic() + poll_interval[sheet_url]
 
-            time.sleep(max(10, 30 / len(sheet_configs)))  # Adjust wait time based on the number of templates
+            deadlines = [next_poll_at[url] for url in next_poll_at]
+            sleep_for = max(1, min(deadlines) - time.monotonic()) if deadlines else MIN_POLL
+            time.sleep(min(sleep_for, MAX_POLL))
         except Exception as e:
             print(f"Error: {e}")
             time.sleep(10)  # Retry after a short delay
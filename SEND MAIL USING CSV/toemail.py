@@ -2,6 +2,10 @@ from PIL import Image
 import os
 import time
 import csv
+import copy
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from tqdm import tqdm
 import smtplib
 from email.mime.multipart import MIMEMultipart
@@ -20,45 +24,93 @@ SMTP_PORT = int(os.getenv("SMTP_PORT", 587))
 EMAIL_USER = os.getenv("EMAIL_USER")
 EMAIL_PASSWORD = os.getenv("EMAIL_PASSWORD")
 
+# Each worker thread keeps one authenticated SMTP session and reuses it
+# for every message it sends; the TLS handshake + login (~1s) is paid
+# once per thread instead of once per recipient. SMTP I/O releases the
+# GIL, so threads overlap cleanly.
+_smtp_local = threading.local()
+_open_connections = []
+_open_connections_lock = threading.Lock()
+
+def _get_smtp_connection():
+    """Return this thread's SMTP session, connecting and logging in once."""
+    server = getattr(_smtp_local, "server", None)
+    if server is None:
+        server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT)
+        server.starttls()
+        server.login(EMAIL_USER, EMAIL_PASSWORD)
+        _smtp_local.server = server
+        with _open_connections_lock:
+            _open_connections.append(server)
+    return server
+
+def _close_smtp_connections():
+    """Quit every SMTP session opened by the worker threads."""
+    with _open_connections_lock:
+        servers, _open_connections[:] = list(_open_connections), []
+    for server in servers:
+        try:
+            server.quit()
+        except Exception:
+            pass
+
+@functools.lru_cache(maxsize=8)
+def _attachment_part(attachment_path):
+    """
+    Read and base64-encode an attachment once per path. Every recipient in
+    a bulk run gets the same file, so the file read and the base64 pass
+    (the expensive part) are paid once; callers attach a shallow clone.
+    """
+    with open(attachment_path, "rb") as attachment:
+        mime_base = MIMEBase('application', 'octet-stream')
+        mime_base.set_payload(attachment.read())
+        encoders.encode_base64(mime_base)
+        mime_base.add_header('Content-Disposition', f'attachment; filename={os.path.basename(attachment_path)}')
+    return mime_base
+
+def make_message(subject, recipient, body, attachment_path):
+    """Build the MIME message for one recipient."""
+    message = MIMEMultipart()
+    message['From'] = EMAIL_USER
+    message['To'] = recipient
+    message['Subject'] = subject
+
+    # Attach HTML body
+    message.attach(MIMEText(body, 'html'))
+
+    if attachment_path and os.path.exists(attachment_path):
+        message.attach(copy.copy(_attachment_part(attachment_path)))
+    return message
+
 def send_email_with_attachment(subject, recipient, body, attachment_path):
-    """Send an email with an attachment."""
+    """Send an email with an attachment over this thread's SMTP session."""
     try:
-        message = MIMEMultipart()
-        message['From'] = EMAIL_USER
-        message['To'] = recipient
-        message['Subject'] = subject
-        
-        # Attach HTML body
-        message.attach(MIMEText(body, 'html'))
-        
-        if attachment_path and os.path.exists(attachment_path):
-            with open(attachment_path, "rb") as attachment:
-                mime_base = MIMEBase('application', 'octet-stream')
-                mime_base.set_payload(attachment.read())
-                encoders.encode_base64(mime_base)
-                mime_base.add_header('Content-Disposition', f'attachment; filename={os.path.basename(attachment_path)}')
-                message.attach(mime_base)
-        
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-            server.starttls()
-            server.login(EMAIL_USER, EMAIL_PASSWORD)
-            server.send_message(message)
-        
+        message = make_message(subject, recipient, body, attachment_path)
+        _get_smtp_connection().send_message(message)
         print(f"Email sent to {recipient} with attachment {attachment_path}")
     except Exception as e:
+        # Drop the (possibly broken) session so the next send reconnects.
+        server = getattr(_smtp_local, "server", None)
+        _smtp_local.server = None
+        if server is not None:
+            try:
+                server.close()
+            except Exception:
+                pass
         print(f"Failed to send email to {recipient}: {e}")
 
 def send_bulk_emails(csv_file, attachment_path):
     """Send emails to all recipients in the CSV file."""
+    tasks = []
     with open(csv_file, mode="r", encoding="utf-8") as file:
         reader = csv.DictReader(file)
-        for row in tqdm(reader, desc="Sending Emails"):
+        for row in reader:
             name = row.get("name", "User")
             email = row.get("mail")
             if not email:
                 print(f"Skipping invalid row: {row}")
                 continue
-            
+
             subject = "Payment Details for ESP32"
             body = f"""
             <html>
@@ -77,7 +129,15 @@ def send_bulk_emails(csv_file, attachment_path):
 </html>
 
             """
-            send_email_with_attachment(subject, email, body, attachment_path)
+            tasks.append((subject, email, body, attachment_path))
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(tqdm(
+            pool.map(lambda args: send_email_with_attachment(*args), tasks),
+            total=len(tasks),
+            desc="Sending Emails",
+        ))
+    _close_smtp_connections()
 
 def main():
     recipients_csv = "recipients.csv"
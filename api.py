@@ -1,27 +1,46 @@
 import os
 import random
 import string
+import secrets
+import base64
+import hashlib
 import json
 import time
+import queue
+import functools
 import requests
-from datetime import datetime
+from requests.adapters import HTTPAdapter, Retry
+from datetime import datetime, timezone
 from io import BytesIO
-from flask import Flask, request, jsonify, send_from_directory, url_for
+import numpy as np
+from flask import Flask, request, jsonify, send_from_directory, send_file, url_for, Response, stream_with_context, make_response
+from cachetools import TTLCache
 from PIL import Image
 import qrcode
 from qrcode.constants import ERROR_CORRECT_L
+try:
+    import segno  # Much faster QR encoder; optional, qrcode remains the fallback
+except ImportError:
+    segno = None
+try:
+    import orjson  # C JSON serializer for request/response bodies; optional
+except ImportError:
+    orjson = None
+from flask.json.provider import JSONProvider
 from dotenv import load_dotenv
 import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.base import MIMEBase
-from email import encoders
-from pymongo import MongoClient, ReturnDocument
+import mimetypes
+from email.message import EmailMessage
+from pymongo import MongoClient, ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError, BulkWriteError
+from collections import deque
+import atexit
 import logging
 import psutil
 import platform
 import threading
-from bson import ObjectId  # For converting job _id when querying status
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from bson import ObjectId, json_util  # For job _id conversion and BSON-aware JSON encoding
 
 # ---------------- Load Environment Variables ---------------- #
 load_dotenv()
@@ -36,10 +55,33 @@ logger = logging.getLogger(__name__)
 
 # ---------------- MongoDB Connection ---------------- #
 MONGO_URI = os.getenv("MONGO_URI")
-client = MongoClient(MONGO_URI)
+# Explicit pool sizing so concurrent job workers and serving threads do
+# not queue behind the driver defaults; warm idle connections are kept
+# around for five minutes.
+client = MongoClient(
+    MONGO_URI,
+    maxPoolSize=100,
+    minPoolSize=10,
+    maxIdleTimeMS=300_000,
+    waitQueueTimeoutMS=10_000,
+    retryWrites=True,
+    compressors="zlib",
+)
 db = client["savishkaara-aio"]
 collection = db["event_registration"]
 job_queue_collection = db["job_queue"]  # New collection for jobs
+metadata_collection = db["metadata"]  # Small counters (generated-image count)
+
+# Fast-write handle for the ticket insert batcher: w=1 without the
+# journal wait keeps the acknowledgement cheap while still surfacing
+# server-side errors — with w=0 a duplicate ticket_number would be
+# rejected by the unique index and nobody would ever hear about it,
+# leaving a ticket in the wild with no matching document. Reads and
+# atomic updates stay on the default client with full write concern.
+# zlib wire compression needs no extra package (zstd would).
+fast_client = MongoClient(MONGO_URI, maxPoolSize=200, w=1, journal=False, compressors="zlib")
+fast_collection = fast_client["savishkaara-aio"]["event_registration"]
+fast_metadata = fast_client["savishkaara-aio"]["metadata"]
 
 # Log database connection status
 try:
@@ -48,6 +90,36 @@ try:
 except Exception as e:
     logger.error(f"MongoDB connection failed: {e}")
 
+# Unique index so ticket-number uniqueness is enforced by the database
+# (insert-and-retry on DuplicateKeyError) instead of a find_one probe
+# before every insert.
+try:
+    collection.create_index([("ticket_number", 1)], unique=True, background=True)
+    # Compound index covering the atomic verify filter.
+    collection.create_index([("ticket_number", 1), ("verified", 1)], background=True)
+    # Descending timestamp index backing /tickets range pagination.
+    collection.create_index([("timestamp", -1)], background=True)
+    # Content-key lookup for idempotent generate_ticket replays.
+    collection.create_index([("render_key", 1)], background=True, sparse=True)
+except Exception as e:
+    logger.error(f"Failed to create ticket indexes: {e}")
+
+# Compound index so the atomic job claim (queued, oldest first) is an
+# index walk instead of a scan past every finished document, plus a TTL
+# sweep that expires completed/error jobs after a day so the collection
+# working set stays bounded. Jobs still queued or processing never match
+# the partial filter and are kept.
+try:
+    job_queue_collection.create_index([("status", 1), ("created_at", 1)], background=True)
+    job_queue_collection.create_index(
+        [("updated_at", 1)],
+        expireAfterSeconds=86400,
+        partialFilterExpression={"status": {"$in": ["completed", "error"]}},
+        background=True,
+    )
+except Exception as e:
+    logger.error(f"Failed to create job_queue indexes: {e}")
+
 # ---------------- Email & Server Configuration ---------------- #
 DEFAULT_SMTP_SERVER = os.getenv("SMTP_SERVER", "smtp.gmail.com")
 DEFAULT_SMTP_PORT = int(os.getenv("SMTP_PORT", 587))
@@ -63,41 +135,138 @@ TEMPLATES_FOLDER = "templates"
 if not os.path.exists(TEMPLATES_FOLDER):
     os.makedirs(TEMPLATES_FOLDER)
 
+def _now():
+    """Current UTC time; skips the localtime/TZ lookup a naive now() pays."""
+    return datetime.now(timezone.utc)
+
 # ---------------- Global Variables ---------------- #
-SERVER_START_TIME = datetime.now()
+SERVER_START_TIME = _now()
+
+# ---------------- Background System Metrics Sampler ---------------- #
+# Snapshot updated by a daemon thread so /status never blocks on
+# psutil.cpu_percent(interval=...) in a serving thread.
+_METRICS = {"cpu": 0.0, "mem": psutil.virtual_memory()}
+_METRICS_LOCK = threading.Lock()
+
+def _sample_system_metrics():
+    while True:
+        # cpu_percent with an interval blocks here, not in a request thread.
+        cpu = psutil.cpu_percent(interval=1.0)
+        mem = psutil.virtual_memory()
+        with _METRICS_LOCK:
+            _METRICS["cpu"] = cpu
+            _METRICS["mem"] = mem
+        time.sleep(1)
+
+threading.Thread(target=_sample_system_metrics, daemon=True).start()
 
 # ---------------- Database Utility Functions ---------------- #
 
-def generate_unique_ticket_number():
-    """Generate a unique ticket number by checking the event_registration collection."""
+def _random_ticket_number():
+    """Return a random 8-char uppercase ticket number from one os.urandom call."""
+    return base64.b32encode(secrets.token_bytes(5)).decode()[:8]
+
+# ---------------- Batched Ticket Inserts ---------------- #
+# New ticket documents are buffered and written with a single insert_many
+# (every ~100ms, or immediately at _INSERT_BATCH_MAX docs) so bulk ticket
+# generation does not pay a full MongoDB round-trip per document. Read
+# paths call flush_ticket_inserts() first so fresh tickets stay visible.
+_INSERT_BUFFER = deque()
+_INSERT_LOCK = threading.Lock()
+_INSERT_BATCH_MAX = 500
+_INSERT_FLUSH_INTERVAL = 0.1  # seconds
+# Numbers waiting in the buffer; lets save_ticket_in_db spot a collision
+# before the number is baked into a QR image, since the unique index only
+# sees the document at flush time.
+_PENDING_NUMBERS = set()
+
+def flush_ticket_inserts():
+    """Drain the insert buffer with one unordered insert_many call."""
+    with _INSERT_LOCK:
+        if not _INSERT_BUFFER:
+            return
+        batch = list(_INSERT_BUFFER)
+        _INSERT_BUFFER.clear()
+        _PENDING_NUMBERS.clear()
+    try:
+        fast_collection.insert_many(batch, ordered=False)
+    except BulkWriteError as e:
+        # ordered=False means the rest of the batch landed; reconcile the
+        # failures individually. Duplicate ticket numbers (code 11000) are
+        # effectively impossible with 40 random bits and cannot be retried
+        # with the same number anyway, so they are logged loudly; anything
+        # else (transient server error) is re-buffered for the next flush.
+        retry = []
+        for write_error in e.details.get("writeErrors", []):
+            failed = batch[write_error["index"]]
+            if write_error.get("code") == 11000:
+                logger.error(
+                    f"Duplicate ticket number {failed['ticket_number']} rejected by unique index"
+                )
+            else:
+                retry.append(failed)
+        if retry:
+            logger.error(f"Re-buffering {len(retry)} ticket inserts after bulk write errors")
+            with _INSERT_LOCK:
+                _INSERT_BUFFER.extend(retry)
+                _PENDING_NUMBERS.update(doc["ticket_number"] for doc in retry)
+    except Exception as e:
+        logger.error(f"Bulk ticket insert failed: {e}")
+
+def _insert_flusher():
     while True:
-        ticket_number = ''.join(random.choices(string.ascii_uppercase + string.digits, k=8))
-        if not collection.find_one({"ticket_number": ticket_number}):
-            return ticket_number
+        time.sleep(_INSERT_FLUSH_INTERVAL)
+        flush_ticket_inserts()
+
+threading.Thread(target=_insert_flusher, daemon=True).start()
+atexit.register(flush_ticket_inserts)
 
-def save_ticket_in_db(ticket_number, ticket_details):
+def save_ticket_in_db(ticket_details, render_key=None):
     """
-    Save a new ticket document with creation timestamp and verified flag set to False.
+    Queue a new ticket document (creation timestamp, verified flag False)
+    for the batched insert_many flusher, generating its ticket_number in
+    the process.
     Document structure:
       - ticket_number (str)
       - timestamp (datetime)
       - ticket_details (dict)
       - verified (bool)
       - attendance_date_time (datetime or None)
+      - render_key (str or None): content key of the generate inputs,
+        used to detect idempotent replays.
     """
-    document = {
-        "ticket_number": ticket_number,
-        "timestamp": datetime.now(),
-        "ticket_details": ticket_details,
-        "verified": False,
-        "attendance_date_time": None
-    }
-    collection.insert_one(document)
+    with _INSERT_LOCK:
+        ticket_number = _random_ticket_number()
+        for _ in range(5):
+            if ticket_number not in _PENDING_NUMBERS:
+                break
+            ticket_number = _random_ticket_number()
+        _PENDING_NUMBERS.add(ticket_number)
+        ticket_details["ticket_number"] = ticket_number
+        document = {
+            "ticket_number": ticket_number,
+            "timestamp": _now(),
+            "ticket_details": ticket_details,
+            "verified": False,
+            "attendance_date_time": None,
+            "render_key": render_key
+        }
+        _INSERT_BUFFER.append(document)
+        flush_now = len(_INSERT_BUFFER) >= _INSERT_BATCH_MAX
+    if flush_now:
+        flush_ticket_inserts()
     return document
 
-def load_ticket_by_number(ticket_number):
-    """Return the ticket document for a given ticket_number or None."""
-    return collection.find_one({"ticket_number": ticket_number})
+def load_ticket_by_number(ticket_number, projection=None):
+    """
+    Return the ticket document for a given ticket_number or None.
+    By default only the fields callers actually use are fetched; pass a
+    custom projection (or None explicitly in a dict) for more.
+    """
+    flush_ticket_inserts()  # make sure buffered tickets are visible
+    if projection is None:
+        projection = {"ticket_details": 1, "verified": 1, "_id": 0}
+    return collection.find_one({"ticket_number": ticket_number}, projection)
 
 def update_ticket_in_db(ticket_number, additional_data=None):
     """
@@ -106,55 +275,219 @@ def update_ticket_in_db(ticket_number, additional_data=None):
       - verified to True
       - attendance_date_time to current datetime
     Optionally, additional_data can update the ticket_details.
-    Returns the updated document.
+    Returns the updated document, projected down to the fields the
+    response paths echo back (ticket_details, verified) instead of
+    shipping the whole post-image over the wire.
     """
-    update_fields = {"verified": True, "attendance_date_time": datetime.now()}
+    flush_ticket_inserts()  # make sure buffered tickets are visible
+    update_fields = {"verified": True, "attendance_date_time": _now()}
     if additional_data and isinstance(additional_data, dict):
         update_fields["ticket_details"] = additional_data
     updated_doc = collection.find_one_and_update(
         {"ticket_number": ticket_number},
         {"$set": update_fields},
-        return_document=ReturnDocument.AFTER
+        return_document=ReturnDocument.AFTER,
+        projection={"ticket_details": 1, "verified": 1, "_id": 0}
     )
     return updated_doc
 
 # ---------------- Utility Functions for Image & Email ---------------- #
 
-def download_template_image(url):
-    """Download an image from a given URL and return a PIL Image object."""
+# Shared HTTP session so template downloads reuse pooled TCP/TLS
+# connections instead of paying a fresh handshake per fetch.
+SESSION = requests.Session()
+_http_adapter = HTTPAdapter(pool_connections=10, pool_maxsize=50, max_retries=Retry(total=2))
+SESSION.mount("https://", _http_adapter)
+SESSION.mount("http://", _http_adapter)
+
+# Template images are immutable per event, so the raw bytes are cached and
+# each render works on its own decoded copy. Failed fetches are not cached
+# (lru_cache does not memoize raised exceptions). A disk cache under
+# templates/cache/ survives restarts; an ETag sidecar lets the one fetch
+# after a restart turn into a cheap 304 revalidation.
+
+TEMPLATE_CACHE_FOLDER = os.path.join(TEMPLATES_FOLDER, "cache")
+if not os.path.exists(TEMPLATE_CACHE_FOLDER):
+    os.makedirs(TEMPLATE_CACHE_FOLDER)
+
+@functools.lru_cache(maxsize=32)
+def _download_template_bytes_cached(url):
+    cache_path = os.path.join(TEMPLATE_CACHE_FOLDER, hashlib.sha256(url.encode()).hexdigest() + ".png")
+    etag_path = cache_path + ".etag"
+    cached = None
+    headers = {}
+    if os.path.exists(cache_path):
+        with open(cache_path, "rb") as cache_file:
+            cached = cache_file.read()
+        if os.path.exists(etag_path):
+            with open(etag_path, "r") as etag_file:
+                headers["If-None-Match"] = etag_file.read().strip()
+    response = SESSION.get(url, timeout=(3, 10), headers=headers)
+    if response.status_code == 304 and cached is not None:
+        return cached
+    response.raise_for_status()
+    content = response.content
+    with open(cache_path, "wb") as cache_file:
+        cache_file.write(content)
+    etag = response.headers.get("ETag")
+    if etag:
+        with open(etag_path, "w") as etag_file:
+            etag_file.write(etag)
+    return content
+
+def download_template_bytes(url):
+    """Download a template image and return its raw bytes (cached per URL)."""
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        image = Image.open(BytesIO(response.content))
-        return image
+        return _download_template_bytes_cached(url)
     except Exception as e:
         logger.error(f"Error downloading image: {e}")
         return None
 
+@functools.lru_cache(maxsize=32)
+def read_template_bytes(path):
+    """Read a local template image and return its raw bytes (cached per path)."""
+    with open(path, "rb") as template_file:
+        return template_file.read()
+
+# ---------------- SMTP Connection Pool ---------------- #
+
+class SMTPConnectionPool:
+    """
+    Reuse authenticated smtplib.SMTP connections across emails, keyed by
+    (server, port, user). The TLS handshake plus login dominate per-email
+    latency, so keeping sessions alive substantially raises send
+    throughput on bursts. Connections are retired after _MAX_MESSAGES
+    sends, on a failed keepalive, on any send error, or after sitting idle
+    past _IDLE_TIMEOUT (a reaper thread sweeps the pools).
+    """
+    _MAX_MESSAGES = 100
+    _POOL_SIZE = 5
+    _IDLE_TIMEOUT = 60  # seconds
+    _REAP_INTERVAL = 30  # seconds
+
+    def __init__(self):
+        self._pools = {}
+        self._lock = threading.Lock()
+        threading.Thread(target=self._reap_idle_loop, daemon=True).start()
+
+    def _reap_idle_loop(self):
+        while True:
+            time.sleep(self._REAP_INTERVAL)
+            with self._lock:
+                pools = list(self._pools.values())
+            now = time.monotonic()
+            for pool in pools:
+                keep = []
+                while True:
+                    try:
+                        conn = pool.get_nowait()
+                    except queue.Empty:
+                        break
+                    if now - getattr(conn, "_pool_idle_since", now) > self._IDLE_TIMEOUT:
+                        self._close(conn)
+                    else:
+                        keep.append(conn)
+                for conn in keep:
+                    try:
+                        pool.put_nowait(conn)
+                    except queue.Full:
+                        self._close(conn)
+
+    def _pool_for(self, key):
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = self._pools[key] = queue.Queue(maxsize=self._POOL_SIZE)
+            return pool
+
+    def _connect(self, server, port, user, password):
+        conn = smtplib.SMTP(server, port)
+        conn.starttls()
+        conn.login(user, password)
+        conn._pool_sends = 0  # messages delivered on this connection
+        return conn
+
+    def _acquire(self, server, port, user, password):
+        try:
+            conn = self._pool_for((server, port, user)).get_nowait()
+        except queue.Empty:
+            return self._connect(server, port, user, password)
+        try:
+            conn.noop()  # keepalive probe; replace the connection if stale
+            return conn
+        except smtplib.SMTPException:
+            self._close(conn)
+            return self._connect(server, port, user, password)
+
+    def _release(self, key, conn):
+        if conn._pool_sends >= self._MAX_MESSAGES:
+            self._close(conn)
+            return
+        try:
+            conn.rset()  # drop any transaction state before reuse
+        except smtplib.SMTPException:
+            self._close(conn)
+            return
+        conn._pool_idle_since = time.monotonic()
+        try:
+            self._pool_for(key).put_nowait(conn)
+        except queue.Full:
+            self._close(conn)
+
+    @staticmethod
+    def _close(conn):
+        try:
+            conn.quit()
+        except Exception:
+            pass
+
+    def send(self, message, server, port, user, password):
+        """Send message on a pooled connection, reconnecting once if stale."""
+        conn = self._acquire(server, port, user, password)
+        try:
+            try:
+                conn.send_message(message)
+            except smtplib.SMTPServerDisconnected:
+                self._close(conn)
+                conn = self._connect(server, port, user, password)
+                conn.send_message(message)
+        except Exception:
+            self._close(conn)
+            raise
+        conn._pool_sends += 1
+        self._release((server, port, user), conn)
+
+SMTP_POOL = SMTPConnectionPool()
+
 def send_email_with_attachment(subject, recipient, body, attachment_path, sender_name,
                                email_format="plain", smtp_server=DEFAULT_SMTP_SERVER,
                                smtp_port=DEFAULT_SMTP_PORT, email_user=DEFAULT_EMAIL_USER,
-                               email_password=DEFAULT_EMAIL_PASSWORD):
+                               email_password=DEFAULT_EMAIL_PASSWORD, attachment_bytes=None):
     """
     Send an email with an attachment.
     email_format: "plain" or "html".
+    When attachment_bytes is given the file is attached from memory and
+    attachment_path only supplies the filename, avoiding a disk read for
+    content (like freshly rendered tickets) the caller already holds.
     """
     try:
-        message = MIMEMultipart()
+        message = EmailMessage()
         message['From'] = f"{sender_name} <{email_user}>"
         message['To'] = recipient
         message['Subject'] = subject
-        message.attach(MIMEText(body, email_format))
-        with open(attachment_path, "rb") as attachment:
-            mime_base = MIMEBase('application', 'octet-stream')
-            mime_base.set_payload(attachment.read())
-            encoders.encode_base64(mime_base)
-            mime_base.add_header('Content-Disposition', f'attachment; filename={os.path.basename(attachment_path)}')
-            message.attach(mime_base)
-        with smtplib.SMTP(smtp_server, smtp_port) as server:
-            server.starttls()
-            server.login(email_user, email_password)
-            server.send_message(message)
+        message.set_content(body, subtype='html' if email_format == 'html' else 'plain')
+        content_type = mimetypes.guess_type(attachment_path)[0] or 'application/octet-stream'
+        maintype, subtype = content_type.split('/', 1)
+        if attachment_bytes is None:
+            with open(attachment_path, "rb") as attachment:
+                attachment_bytes = attachment.read()
+        message.add_attachment(
+            attachment_bytes,
+            maintype=maintype,
+            subtype=subtype,
+            filename=os.path.basename(attachment_path)
+        )
+        SMTP_POOL.send(message, smtp_server, smtp_port, email_user, email_password)
         status = f"Email sent to {recipient} with attachment {attachment_path}"
         logger.info(status)
         return status
@@ -163,19 +496,149 @@ def send_email_with_attachment(subject, recipient, body, attachment_path, sender
         logger.error(error_msg)
         return error_msg
 
-def generate_ticket_qr(template_image, image_size=None, qr_config=None, ticket_details=None):
+# ---------------- Background Email Delivery ---------------- #
+# Emails are submitted to a thread pool so HTTP responses never wait out
+# the SMTP round-trip and several accounts can deliver concurrently.
+# EMAIL_WORKERS bounds the number of in-flight SMTP sessions; each worker
+# draws a pooled, already-authenticated connection from SMTP_POOL, so
+# raising it adds concurrency without extra handshake/login cost.
+EMAIL_EXECUTOR = ThreadPoolExecutor(max_workers=int(os.getenv("EMAIL_WORKERS", 8)))
+atexit.register(EMAIL_EXECUTOR.shutdown, True)
+
+# Pacing between sends is enforced per sender account, so one throttled
+# mailbox does not stall deliveries from other credentials.
+_EMAIL_PACING_LOCK = threading.Lock()
+_NEXT_SEND_AT = {}  # email_user -> earliest next send (monotonic seconds)
+
+def _pace_account(email_user):
+    """Block until this account's next send slot, then reserve a new one."""
+    while True:
+        with _EMAIL_PACING_LOCK:
+            now = time.monotonic()
+            next_at = _NEXT_SEND_AT.get(email_user, 0.0)
+            if now >= next_at:
+                _NEXT_SEND_AT[email_user] = now + random.uniform(30, 45)
+                return
+            wait = next_at - now
+        time.sleep(wait)
+
+def _deliver_ticket_email(ticket_number, kwargs):
+    try:
+        _pace_account(kwargs.get("email_user"))
+        status = send_email_with_attachment(**kwargs)
+        if ticket_number:
+            collection.update_one(
+                {"ticket_number": ticket_number},
+                {"$set": {
+                    "email_sent": status.startswith("Email sent"),
+                    "email_status": status
+                }}
+            )
+    except Exception as e:
+        logger.error(f"Email delivery failed for {kwargs.get('recipient')}: {e}")
+
+def queue_ticket_email(ticket_number=None, **kwargs):
+    """
+    Queue an email for background delivery and return the queued status.
+    The delivery task records the outcome on the ticket document.
+    """
+    EMAIL_EXECUTOR.submit(_deliver_ticket_email, ticket_number, kwargs)
+    return "queued"
+
+# Pool of worker processes for the CPU-bound rendering step (QR encode, resize,
+# paste, PNG encode) so concurrent requests are not serialized behind the GIL.
+RENDER_POOL = ProcessPoolExecutor(max_workers=max(1, (os.cpu_count() or 2) - 1))
+
+@functools.lru_cache(maxsize=None)
+def _qr_version_for_length(data_length):
+    """
+    Return the smallest QR version that fits a byte-mode payload of the given
+    length. Cached so the version search from make(fit=True) runs once per
+    payload length instead of on every ticket.
+    """
+    probe = qrcode.QRCode(error_correction=ERROR_CORRECT_L)
+    # Lowercase probe data forces byte mode, the same capacity class as the
+    # real payloads (which contain lowercase values and ": " separators).
+    probe.add_data("a" * data_length)
+    probe.make(fit=True)
+    return probe.version
+
+# Thread-local scratch encoder so each render-pool worker reuses one
+# QRCode object (and its internal buffers) instead of allocating per call.
+_qr_tls = threading.local()
+
+def _get_qr_encoder(version):
+    encoder = getattr(_qr_tls, "encoder", None)
+    if encoder is None:
+        encoder = qrcode.QRCode(error_correction=ERROR_CORRECT_L, box_size=1, border=4)
+        _qr_tls.encoder = encoder
+    encoder.clear()
+    encoder.version = version
+    return encoder
+
+def _make_qr_image(qr_data_str, qr_size):
     """
-    Generate a ticket image with an overlaid QR code.
-    Returns: (ticket_number, output_path, ticket_details)
+    Render the QR code for qr_data_str as an RGB image of qr_size pixels,
+    preferring segno's encoder (several times faster than python-qrcode)
+    when it is installed.
+    """
+    if segno is not None:
+        qr = segno.make(qr_data_str, error='L')
+        width, _ = qr.symbol_size(scale=1, border=4)
+        buffer = BytesIO()
+        qr.save(buffer, kind='png', scale=max(1, qr_size // width), border=4)
+        qr_image = Image.open(buffer).convert('L')
+    else:
+        qr_obj = _get_qr_encoder(_qr_version_for_length(len(qr_data_str)))
+        qr_obj.add_data(qr_data_str)
+        qr_obj.make(fit=False)
+        # Upscale the boolean module grid with integer nearest-neighbor
+        # repeats instead of rendering at box_size=10 and resampling.
+        # repeat() is a straight memory copy, cheaper than the kron product
+        # (which multiplies against a ones block).
+        matrix = np.array(qr_obj.get_matrix(), dtype=np.uint8)  # border included
+        scale = max(1, qr_size // matrix.shape[0])
+        pixels = ((1 - matrix) * 255).repeat(scale, axis=0).repeat(scale, axis=1)
+        qr_image = Image.fromarray(pixels, mode='L')
+    if qr_image.size != (qr_size, qr_size):
+        # Exact-size nearest-neighbor snap keeps module edges crisp.
+        qr_image = qr_image.resize((qr_size, qr_size), Image.NEAREST)
+    return qr_image
+
+@functools.lru_cache(maxsize=16)
+def _sized_template(template_bytes, width, height):
+    """
+    Decode (and optionally resize) a template once per (bytes, size) key.
+    Lives in each render-pool worker, so a batch of tickets sharing one
+    template pays the decode + resample once; callers must .copy() before
+    drawing on the returned image.
+    """
+    image = Image.open(BytesIO(template_bytes))
+    if width and height:
+        # For JPEG templates draft() asks the decoder for the nearest DCT
+        # scale (1/2, 1/4, 1/8) at or above the target, so the full-size
+        # bitmap is never materialized; it is a no-op for PNG.
+        image.draft("RGB", (width, height))
+        image = image.resize((width, height))
+    else:
+        image.load()
+    return image
+
+def _render_ticket(template_bytes, image_size, qr_config, ticket_details):
+    """
+    Render the ticket image with its QR code overlay and return the PNG bytes.
+    Pure function (no DB or network access) so it is picklable and can run
+    inside RENDER_POOL worker processes.
     """
     if image_size and "width" in image_size and "height" in image_size:
-        template_image = template_image.resize((image_size["width"], image_size["height"]))
-    ticket_number = generate_unique_ticket_number()
-    if ticket_details is None:
-        ticket_details = {}
-    ticket_details["ticket_number"] = ticket_number
+        base_image = _sized_template(template_bytes, image_size["width"], image_size["height"])
+    else:
+        base_image = _sized_template(template_bytes, None, None)
 
-    qr_data_str = "\n".join(f"{key.upper()}: {value}" for key, value in ticket_details.items())
+    # map over the %-formatter bound method avoids building an f-string
+    # frame per field on the hot render path.
+    qr_data_str = "\n".join(map("%s: %s".__mod__,
+                                ((key.upper(), value) for key, value in ticket_details.items())))
     default_qr_config = {"size": 150, "offset": {"x": 50, "y": 120}, "rotation": 0}
     if qr_config:
         default_qr_config.update(qr_config)
@@ -184,33 +647,105 @@ def generate_ticket_qr(template_image, image_size=None, qr_config=None, ticket_d
     offset_y = default_qr_config["offset"].get("y", 120)
     rotation = default_qr_config.get("rotation", 0)
 
-    qr_obj = qrcode.QRCode(
-        version=1,
-        error_correction=ERROR_CORRECT_L,
-        box_size=10,
-        border=4,
-    )
-    qr_obj.add_data(qr_data_str)
-    qr_obj.make(fit=True)
-    qr_image = qr_obj.make_image(fill_color="black", back_color="white").convert('RGB')
-    qr_image = qr_image.resize((qr_size, qr_size))
+    qr_image = _make_qr_image(qr_data_str, qr_size)
     if rotation:
         qr_image = qr_image.rotate(rotation, expand=1)
-    position = (
-        template_image.width - qr_image.width - offset_x,
-        template_image.height - qr_image.height - offset_y
-    )
-    template_image.paste(qr_image, position)
+    x0 = base_image.width - qr_image.width - offset_x
+    y0 = base_image.height - qr_image.height - offset_y
+    if (not rotation and base_image.mode in ("RGB", "L")
+            and x0 >= 0 and y0 >= 0
+            and x0 + qr_image.width <= base_image.width
+            and y0 + qr_image.height <= base_image.height):
+        # Fused copy + paste: materialize the per-ticket copy as one NumPy
+        # array and broadcast the grayscale QR into its slice, skipping
+        # PIL's generic blit path entirely. Only RGB/L templates qualify:
+        # broadcasting into RGBA would blast the QR into the alpha channel
+        # and for palette images the values would land as palette indices.
+        template_array = np.array(base_image)
+        qr_array = np.asarray(qr_image)
+        if template_array.ndim == 3:
+            template_array[y0:y0 + qr_image.height, x0:x0 + qr_image.width, :] = qr_array[..., None]
+        else:
+            template_array[y0:y0 + qr_image.height, x0:x0 + qr_image.width] = qr_array
+        template_image = Image.fromarray(template_array)
+    else:
+        # Rotated, out-of-bounds or non-RGB/L overlays keep PIL's paste,
+        # which clips and handles mode conversion.
+        template_image = base_image.copy()
+        template_image.paste(qr_image, (x0, y0))
+    buffer = BytesIO()
+    # compress_level=1 encodes several times faster than the zlib default
+    # (6) at a modest size cost; tickets are one-shot files, not archives.
+    template_image.save(buffer, format="PNG", compress_level=1, optimize=False)
+    return buffer.getvalue()
+
+def generate_ticket_qr(template_bytes, image_size=None, qr_config=None, ticket_details=None):
+    """
+    Generate a ticket image with an overlaid QR code from raw template bytes.
+    The rendering itself runs in RENDER_POOL; DB access and the file write
+    stay on the calling thread. A repeat submission with identical inputs
+    (same details, template, size and QR config) maps back to the ticket
+    document it already created, so retried jobs neither allocate a second
+    ticket number nor re-render the finished file.
+    Returns: (ticket_number, output_path, ticket_details, png_bytes)
+    """
+    if ticket_details is None:
+        ticket_details = {}
+
+    # Content key over the request inputs only. The generated ticket_number
+    # is deliberately excluded: it is random per insert, so hashing it would
+    # make every call unique and the replay lookup below could never hit.
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps(ticket_details, sort_keys=True, default=str).encode())
+    digest.update(hashlib.blake2b(template_bytes, digest_size=8).digest())
+    digest.update(json.dumps(image_size or {}, sort_keys=True).encode())
+    digest.update(json.dumps(qr_config or {}, sort_keys=True).encode())
+    render_key = digest.hexdigest()
+
     event_name = ticket_details.get("event", "EVENT")
     roll_no = ticket_details.get("roll_no", "UNKNOWN")
-    ticket_filename = f"{event_name}_{roll_no}_{ticket_number}.png"
+    ticket_filename = f"{event_name}_{roll_no}_{render_key}.png"
     output_path = os.path.join(OUTPUT_FOLDER, ticket_filename)
-    template_image.save(output_path)
 
-    # Save the ticket in the database
-    save_ticket_in_db(ticket_number, ticket_details)
+    flush_ticket_inserts()  # buffered tickets must be visible to the lookup
+    existing = collection.find_one(
+        {"render_key": render_key},
+        {"ticket_number": 1, "ticket_details": 1, "_id": 0}
+    )
+    if existing:
+        # Replay: reuse the stored number and details (which already embed
+        # the ticket_number the QR was rendered with).
+        ticket_number = existing["ticket_number"]
+        ticket_details = existing["ticket_details"]
+        if os.path.exists(output_path):
+            with open(output_path, "rb") as ticket_file:
+                png_bytes = ticket_file.read()
+            with _IMG_CACHE_LOCK:
+                _IMG_CACHE[ticket_filename] = png_bytes
+            return ticket_number, output_path, ticket_details, png_bytes
+        # File was purged (e.g. delete_all_images); fall through and
+        # re-render from the stored details.
+    else:
+        # The insert assigns the unique ticket_number, which must be known
+        # before rendering because it is embedded in the QR payload.
+        document = save_ticket_in_db(ticket_details, render_key=render_key)
+        ticket_number = document["ticket_number"]
+
+    png_bytes = RENDER_POOL.submit(
+        _render_ticket, template_bytes, image_size, qr_config, ticket_details
+    ).result()
 
-    return ticket_number, output_path, ticket_details
+    with open(output_path, "wb") as ticket_file:
+        ticket_file.write(png_bytes)
+    with _IMG_CACHE_LOCK:
+        _IMG_CACHE[ticket_filename] = png_bytes
+    try:
+        # Fire-and-forget (w=0) counter bump backing /ticket_count.
+        fast_metadata.update_one({"_id": "generated_images"}, {"$inc": {"count": 1}}, upsert=True)
+    except Exception as e:
+        logger.error(f"Failed to bump generated-image counter: {e}")
+
+    return ticket_number, output_path, ticket_details, png_bytes
 
 # ---------------- Flask API Endpoints ---------------- #
 
@@ -219,8 +754,71 @@ app = Flask(__name__)
 app.config["SERVER_NAME"] = os.getenv("SERVER_NAME", "0.0.0.0:3030")
 app.config["PREFERRED_URL_SCHEME"] = "http"
 
+class OrjsonProvider(JSONProvider):
+    """
+    Flask JSON provider backed by orjson, so jsonify / request.get_json run
+    through the C serializer. Datetimes use orjson's native path
+    (OPT_NAIVE_UTC); anything else non-native (e.g. ObjectId) falls back to
+    str().
+    """
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(
+            obj, default=str, option=orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY
+        ).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+
+# ASGI adapter so the same app can be served by uvicorn (see __main__);
+# uvloop/httptools are picked up automatically by uvicorn when installed.
+try:
+    from asgiref.wsgi import WsgiToAsgi
+    asgi_app = WsgiToAsgi(app)
+except ImportError:
+    asgi_app = None
+
+def cache_response(ttl):
+    """
+    Memoize a view's serialized JSON response for ttl seconds so
+    high-frequency idempotent GETs (health checks, dashboards) are served
+    the same bytes without redoing any work.
+    """
+    def decorator(view):
+        cached = {"expires": 0.0, "body": None, "status": 200}
+
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            now = time.monotonic()
+            if cached["body"] is None or now >= cached["expires"]:
+                response = make_response(view(*args, **kwargs))
+                cached["body"] = response.get_data()
+                cached["status"] = response.status_code
+                cached["expires"] = now + ttl
+            return Response(
+                cached["body"],
+                status=cached["status"],
+                mimetype='application/json',
+                headers={'Cache-Control': f'max-age={ttl}'}
+            )
+        return wrapper
+    return decorator
+
+# Recently rendered tickets kept in memory so /generated/<file> (and the
+# email task) can skip the disk round-trip; disk remains the fallback and
+# the durable copy.
+_IMG_CACHE = TTLCache(maxsize=10_000, ttl=3600)
+_IMG_CACHE_LOCK = threading.Lock()
+
 @app.route('/generated/<filename>')
 def serve_generated_ticket(filename):
+    with _IMG_CACHE_LOCK:
+        cached = _IMG_CACHE.get(filename)
+    if cached is not None:
+        return send_file(BytesIO(cached), mimetype="image/png", download_name=filename)
     return send_from_directory(OUTPUT_FOLDER, filename)
 
 # ----- Processing Functions -----
@@ -234,28 +832,30 @@ def process_generate_ticket(data):
     email = data["email"].strip()
 
     use_image_url = data.get("use_image_url", False)
-    template_image = None
+    template_bytes = None
     if use_image_url:
         if "template_image_url" not in data or not data["template_image_url"]:
             return {"error": "template_image_url must be provided when use_image_url is true"}, 400
-        template_image = download_template_image(data["template_image_url"])
-        if template_image is None:
+        template_bytes = download_template_bytes(data["template_image_url"])
+        if template_bytes is None:
             return {"error": "Failed to download template image from URL"}, 400
     else:
         if "template_image_path" not in data or not data["template_image_path"]:
             return {"error": "template_image_path must be provided when use_image_url is false"}, 400
         template_filename = data["template_image_path"]
         template_path = os.path.join(TEMPLATES_FOLDER, template_filename)
-        if not os.path.exists(template_path):
+        # EAFP: let the read raise instead of paying a separate stat first.
+        try:
+            template_bytes = read_template_bytes(template_path)
+        except FileNotFoundError:
             return {"error": f"Template image not found at {template_path}"}, 400
-        template_image = Image.open(template_path)
 
     image_size = data.get("image_size")
     qr_config = data.get("qr_config")
     ticket_details = data.get("ticket_details", {})
 
-    ticket_number, output_path, qr_data = generate_ticket_qr(
-        template_image,
+    ticket_number, output_path, qr_data, png_bytes = generate_ticket_qr(
+        template_bytes,
         image_size=image_size,
         qr_config=qr_config,
         ticket_details=ticket_details
@@ -270,12 +870,14 @@ def process_generate_ticket(data):
         email_subject = data.get("email_subject")
         email_body = data.get("email_body")
         email_format = data.get("email_format", "plain")
-        email_status = send_email_with_attachment(
-            email_subject,
-            email,
-            email_body,
-            output_path,
-            sender_name,
+        email_status = queue_ticket_email(
+            ticket_number=ticket_number,
+            subject=email_subject,
+            recipient=email,
+            body=email_body,
+            attachment_path=output_path,
+            attachment_bytes=png_bytes,
+            sender_name=sender_name,
             email_format=email_format,
             smtp_server=DEFAULT_SMTP_SERVER,
             smtp_port=DEFAULT_SMTP_PORT,
@@ -297,29 +899,38 @@ def process_generate_ticket(data):
 def process_verify_ticket(data):
     """
     Process ticket verification.
+    The verified-state transition is a single atomic find_one_and_update,
+    so two concurrent scans of the same ticket cannot both pass.
     """
     ticket_number = data.get("ticket_number", "").strip()
     if not ticket_number:
         return {"error": "Missing ticket_number field"}, 400
 
-    ticket = load_ticket_by_number(ticket_number)
-    if not ticket:
-        return {"valid": False, "message": "Ticket not found."}, 404
-
-    if ticket.get("verified", False):
-        return {
-            "valid": False,
-            "message": "Ticket already verified.",
-            "ticket_details": ticket["ticket_details"]
-        }, 200
-    else:
-        updated_ticket = update_ticket_in_db(ticket_number)
+    flush_ticket_inserts()  # make sure buffered tickets are visible
+    updated_ticket = collection.find_one_and_update(
+        {"ticket_number": ticket_number, "verified": False},
+        {"$set": {"verified": True, "attendance_date_time": _now()}},
+        return_document=ReturnDocument.AFTER,
+        projection={"ticket_details": 1, "_id": 0}
+    )
+    if updated_ticket:
         return {
             "valid": True,
             "message": "Ticket is verified.",
             "ticket_details": updated_ticket["ticket_details"]
         }, 200
 
+    # No unverified match: distinguish "not found" from "already verified"
+    # with one cheap projected lookup.
+    ticket = load_ticket_by_number(ticket_number)
+    if not ticket:
+        return {"valid": False, "message": "Ticket not found."}, 404
+    return {
+        "valid": False,
+        "message": "Ticket already verified.",
+        "ticket_details": ticket["ticket_details"]
+    }, 200
+
 def process_update_ticket(data):
     """
     Process ticket update.
@@ -350,27 +961,93 @@ def add_job(job_type, data):
         "job_type": job_type,
         "data": data,
         "status": "queued",
-        "created_at": datetime.now(),
-        "updated_at": datetime.now(),
+        "created_at": _now(),
+        "updated_at": _now(),
         "result": None
     }
     inserted = job_queue_collection.insert_one(job)
     return str(inserted.inserted_id)
 
+# Job completion writes are coalesced into one bulk_write per flush window,
+# mirroring the ticket insert batcher; /job_status flushes first so a
+# client polling its job never reads stale state.
+_JOB_UPDATE_BUFFER = deque()
+_JOB_UPDATE_LOCK = threading.Lock()
+
+def queue_job_update(job_id, fields):
+    """Queue a $set on the given job document for the next bulk flush."""
+    with _JOB_UPDATE_LOCK:
+        _JOB_UPDATE_BUFFER.append(UpdateOne({"_id": job_id}, {"$set": fields}))
+
+def flush_job_updates():
+    """Drain the job-update buffer with one unordered bulk_write call."""
+    with _JOB_UPDATE_LOCK:
+        if not _JOB_UPDATE_BUFFER:
+            return
+        ops = list(_JOB_UPDATE_BUFFER)
+        _JOB_UPDATE_BUFFER.clear()
+    try:
+        job_queue_collection.bulk_write(ops, ordered=False)
+    except Exception as e:
+        logger.error(f"Bulk job-status update failed: {e}")
+
+def _job_update_flusher():
+    while True:
+        time.sleep(_INSERT_FLUSH_INTERVAL)
+        flush_job_updates()
+
+threading.Thread(target=_job_update_flusher, daemon=True).start()
+atexit.register(flush_job_updates)
+
+NUM_WORKERS = int(os.getenv("JOB_WORKERS", 8))
+_JOB_SHUTDOWN = threading.Event()
+
+# Change-stream watcher: wakes the worker pool the moment a queued job is
+# inserted instead of waiting out the poll interval. Needs a replica set;
+# on a standalone server watch() raises and the workers simply fall back
+# to the short poll. Workers still re-poll every 30s regardless, so jobs
+# missed across a resume-token gap are picked up.
+_JOB_WAKEUP = threading.Event()
+_JOB_WATCHER_ALIVE = threading.Event()
+
+def _job_queue_watcher():
+    pipeline = [{"$match": {"operationType": "insert", "fullDocument.status": "queued"}}]
+    while not _JOB_SHUTDOWN.is_set():
+        try:
+            with job_queue_collection.watch(pipeline) as stream:
+                _JOB_WATCHER_ALIVE.set()
+                for _change in stream:
+                    _JOB_WAKEUP.set()
+                    if _JOB_SHUTDOWN.is_set():
+                        break
+        except Exception as e:
+            _JOB_WATCHER_ALIVE.clear()
+            logger.error(f"Job-queue change stream unavailable, polling instead: {e}")
+            time.sleep(30)  # retry in case the deployment becomes a replica set
+
+threading.Thread(target=_job_queue_watcher, daemon=True, name="job-watcher").start()
+
 def job_processor():
     """
-    Background thread that continuously polls the job_queue collection for queued jobs,
-    processes them, updates the job status, and enforces a delay if email sending was involved.
+    Worker loop that polls the job_queue collection for queued jobs,
+    processes them and records the result. NUM_WORKERS of these run in
+    parallel; the find_one_and_update claim is atomic, so two workers can
+    never pick up the same job. Email pacing is handled per sender account
+    in the delivery layer, so it only slows the deliveries it has to.
     """
-    while True:
+    while not _JOB_SHUTDOWN.is_set():
         # Fetch one job with status 'queued', ordered by created_at
         job = job_queue_collection.find_one_and_update(
             {"status": "queued"},
-            {"$set": {"status": "processing", "updated_at": datetime.now()}},
+            {"$set": {"status": "processing", "updated_at": _now()}},
             sort=[("created_at", 1)]
         )
         if job is None:
-            time.sleep(1)
+            # With a live change stream, sleep until a job insert wakes us
+            # (30s safety re-poll); without one, keep the 1s poll floor.
+            timeout = 30 if _JOB_WATCHER_ALIVE.is_set() else 1
+            _JOB_WAKEUP.wait(timeout)
+            _JOB_WAKEUP.clear()
             continue
 
         job_type = job["job_type"]
@@ -391,24 +1068,14 @@ def job_processor():
             result = {"error": str(e)}
             status_code = 500
 
-        # Update the job document with the result and status
+        # Queue the result and status for the batched job-update flusher
         new_status = "completed" if status_code == 200 else "error"
-        job_queue_collection.update_one(
-            {"_id": job["_id"]},
-            {"$set": {"status": new_status, "result": result, "updated_at": datetime.now()}}
-        )
-
-        # If the job was a ticket generation with email sending, add a delay
-        if job_type == "generate_ticket" and data.get("send_email", False):
-            # Check if the email_status indicates that an email was sent successfully
-            if isinstance(result, dict) and "email_status" in result and "sent" in result["email_status"].lower():
-                delay = random.uniform(30, 45)
-                logger.info(f"Email sent; waiting for {delay:.2f} seconds before processing the next job.")
-                time.sleep(delay)
+        queue_job_update(job["_id"], {"status": new_status, "result": result, "updated_at": _now()})
 
-# Start the job processor thread as a daemon
-job_processor_thread = threading.Thread(target=job_processor, daemon=True)
-job_processor_thread.start()
+# Start the job worker pool as daemon threads
+for _worker_index in range(NUM_WORKERS):
+    threading.Thread(target=job_processor, daemon=True, name=f"job-worker-{_worker_index}").start()
+atexit.register(_JOB_SHUTDOWN.set)
 
 # ----- Endpoints that Add Jobs to the Queue -----
 
@@ -442,6 +1109,7 @@ def job_status():
     job_id = request.args.get("job_id")
     if not job_id:
         return jsonify({"error": "Missing job_id parameter"}), 400
+    flush_job_updates()  # make sure buffered status changes are visible
     try:
         job = job_queue_collection.find_one({"_id": ObjectId(job_id)})
     except Exception:
@@ -449,29 +1117,28 @@ def job_status():
     if not job:
         return jsonify({"error": "Job not found"}), 404
 
-    # Convert ObjectId and datetime fields to strings for JSON serialization
+    # ObjectId still needs a str() pass; datetimes are left alone so the
+    # JSON provider emits ISO-8601 natively instead of Python strftime.
     job["_id"] = str(job["_id"])
-    if "created_at" in job:
-        job["created_at"] = job["created_at"].strftime("%Y-%m-%d %H:%M:%S")
-    if job.get("updated_at"):
-        job["updated_at"] = job["updated_at"].strftime("%Y-%m-%d %H:%M:%S")
     return jsonify(job), 200
 
 @app.route('/status', methods=['GET'])
+@cache_response(ttl=5)
 def server_status():
     """
     GET /status
     Returns the server status along with uptime and system metrics.
     """
-    uptime = datetime.now() - SERVER_START_TIME
+    uptime = _now() - SERVER_START_TIME
     uptime_str = str(uptime).split('.')[0]  # Format as HH:MM:SS
 
-    # Get system metrics
-    cpu_usage = psutil.cpu_percent(interval=0.1)
-    memory_info = psutil.virtual_memory()
+    # Read the latest snapshot from the background sampler
+    with _METRICS_LOCK:
+        cpu_usage = _METRICS["cpu"]
+        memory_info = _METRICS["mem"]
 
     data = {
-        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "timestamp": _now().strftime("%Y-%m-%d %H:%M:%S"),
         "uptime": uptime_str,
         "system_metrics": {
             "cpu_usage_percent": cpu_usage,
@@ -496,13 +1163,25 @@ def delete_all_images():
     Delete all image files in the QR_GENERATED folder.
     Returns a JSON response with the number of files deleted.
     """
-    deleted_count = 0
     try:
-        for filename in os.listdir(OUTPUT_FOLDER):
-            file_path = os.path.join(OUTPUT_FOLDER, filename)
-            if os.path.isfile(file_path):
-                os.remove(file_path)
-                deleted_count += 1
+        with os.scandir(OUTPUT_FOLDER) as entries:
+            paths = [entry.path for entry in entries if entry.is_file()]
+        # unlink is I/O-bound and releases the GIL, so a thread pool turns
+        # a large serial sweep into parallel syscalls.
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            list(pool.map(os.remove, paths))
+        deleted_count = len(paths)
+        try:
+            metadata_collection.update_one(
+                {"_id": "generated_images"}, {"$set": {"count": 0}}, upsert=True
+            )
+        except Exception as e:
+            logger.error(f"Failed to reset generated-image counter: {e}")
+        _TICKET_COUNT_CACHE["expires"] = 0.0
+        # Drop the in-memory PNG cache too, or deleted tickets would keep
+        # serving from RAM for up to the TTL.
+        with _IMG_CACHE_LOCK:
+            _IMG_CACHE.clear()
         response = {
             "message": f"Deleted {deleted_count} files from {OUTPUT_FOLDER}."
         }
@@ -511,15 +1190,39 @@ def delete_all_images():
         logger.error(f"Error deleting images: {e}")
         return jsonify({"error": "Failed to delete images.", "details": str(e)}), 500
 
+# Cached counter read so high-frequency /ticket_count polling costs at
+# most one small metadata lookup every few seconds. The counter document
+# is maintained by generate_ticket_qr / delete_all_images; a missing
+# counter is seeded with one os.scandir sweep of OUTPUT_FOLDER.
+_TICKET_COUNT_CACHE = {"expires": 0.0, "count": 0}
+_TICKET_COUNT_TTL = 5  # seconds
+
+def _count_generated_tickets():
+    """Return the generated-image count from the metadata counter, cached."""
+    now = time.monotonic()
+    if now >= _TICKET_COUNT_CACHE["expires"]:
+        counter_doc = metadata_collection.find_one({"_id": "generated_images"})
+        if counter_doc is not None:
+            count = int(counter_doc.get("count", 0))
+        else:
+            with os.scandir(OUTPUT_FOLDER) as entries:
+                count = sum(1 for entry in entries if entry.is_file())
+            metadata_collection.update_one(
+                {"_id": "generated_images"}, {"$set": {"count": count}}, upsert=True
+            )
+        _TICKET_COUNT_CACHE["count"] = count
+        _TICKET_COUNT_CACHE["expires"] = now + _TICKET_COUNT_TTL
+    return _TICKET_COUNT_CACHE["count"]
+
 @app.route('/ticket_count', methods=['GET'])
+@cache_response(ttl=5)
 def ticket_count():
     """
     Count the number of ticket images in the QR_GENERATED folder.
     Returns a JSON response with the file count.
     """
     try:
-        count = sum(1 for filename in os.listdir(OUTPUT_FOLDER)
-                    if os.path.isfile(os.path.join(OUTPUT_FOLDER, filename)))
+        count = _count_generated_tickets()
         response = {
             "ticket_count": count,
             "message": f"There are {count} ticket images in {OUTPUT_FOLDER}."
@@ -529,6 +1232,18 @@ def ticket_count():
         logger.error(f"Error counting ticket images: {e}")
         return jsonify({"error": "Failed to count ticket images.", "details": str(e)}), 500
 
+# Collection totals only feed pagination metadata, so a 30s-stale
+# estimated count (metadata read, no scan) is plenty.
+_TOTAL_TICKETS_CACHE = {"expires": 0.0, "total": 0}
+_TOTAL_TICKETS_TTL = 30  # seconds
+
+def _estimated_total_tickets():
+    now = time.monotonic()
+    if now >= _TOTAL_TICKETS_CACHE["expires"]:
+        _TOTAL_TICKETS_CACHE["total"] = collection.estimated_document_count()
+        _TOTAL_TICKETS_CACHE["expires"] = now + _TOTAL_TICKETS_TTL
+    return _TOTAL_TICKETS_CACHE["total"]
+
 @app.route('/tickets', methods=['GET'])
 def list_tickets():
     """
@@ -537,36 +1252,55 @@ def list_tickets():
     Query parameters:
       - page (int): Page number (default: 1)
       - per_page (int): Number of tickets per page (default: 10)
+      - after (str): ISO-8601 timestamp; returns tickets strictly older
+        than it. Preferred for walking large collections, since it stays
+        O(per_page) where deep page/skip pagination scans every skipped
+        document.
     """
     try:
         page = int(request.args.get('page', 1))
         per_page = int(request.args.get('per_page', 10))
     except ValueError:
         return jsonify({"error": "Invalid pagination parameters"}), 400
+    after = request.args.get('after')
 
-    skip = (page - 1) * per_page
-    tickets_cursor = collection.find().skip(skip).limit(per_page)
-    tickets = []
-    for ticket in tickets_cursor:
-        # Convert MongoDB's ObjectId and datetime objects to strings
-        ticket['_id'] = str(ticket['_id'])
-        if 'timestamp' in ticket and isinstance(ticket['timestamp'], datetime):
-            ticket['timestamp'] = ticket['timestamp'].strftime("%Y-%m-%d %H:%M:%S")
-        if ticket.get('attendance_date_time') and isinstance(ticket['attendance_date_time'], datetime):
-            ticket['attendance_date_time'] = ticket['attendance_date_time'].strftime("%Y-%m-%d %H:%M:%S")
-        tickets.append(ticket)
-
-    total_tickets = collection.count_documents({})
+    flush_ticket_inserts()  # make sure buffered tickets are visible
+    # Project only the fields the listing needs instead of shipping whole
+    # documents over the wire.
+    projection = {
+        "ticket_number": 1,
+        "ticket_details": 1,
+        "verified": 1,
+        "timestamp": 1,
+        "attendance_date_time": 1
+    }
+    if after:
+        try:
+            after_dt = datetime.fromisoformat(after)
+        except ValueError:
+            return jsonify({"error": "Invalid 'after' timestamp"}), 400
+        query = {"timestamp": {"$lt": after_dt}}
+    else:
+        query = {}
+    tickets_cursor = collection.find(query, projection).sort("timestamp", -1)
+    if not after:
+        tickets_cursor = tickets_cursor.skip((page - 1) * per_page)
+    tickets_cursor = tickets_cursor.limit(per_page)
+    total_tickets = _estimated_total_tickets()
     total_pages = (total_tickets + per_page - 1) // per_page
 
-    response = {
-        "page": page,
-        "per_page": per_page,
-        "total_tickets": total_tickets,
-        "total_pages": total_pages,
-        "tickets": tickets
-    }
-    return jsonify(response), 200
+    def generate():
+        yield (
+            '{"page": %d, "per_page": %d, "total_tickets": %d, "total_pages": %d, "tickets": ['
+            % (page, per_page, total_tickets, total_pages)
+        )
+        for index, ticket in enumerate(tickets_cursor):
+            # json_util handles ObjectId/datetime natively (relaxed mode emits
+            # ISO-8601 strings), so no per-field Python conversion is needed.
+            yield (',' if index else '') + json_util.dumps(ticket, json_options=json_util.RELAXED_JSON_OPTIONS)
+        yield ']}'
+
+    return Response(stream_with_context(generate()), mimetype='application/json')
 
 # ---------------- Production Server Startup ---------------- #
 if __name__ == "__main__":
@@ -587,8 +1321,21 @@ if __name__ == "__main__":
     except Exception as e:
         logger.error(f"MongoDB connection: FAILED - {e}")
 
-    # Start production WSGI server using Waitress
-    from waitress import serve
     public_url = os.getenv("PUBLIC_URL", "http://0.0.0.0:3030")  # e.g., if using ngrok, set PUBLIC_URL env variable
     logger.info(f"Server starting at {public_url}")
-    serve(app, host="0.0.0.0", port=3030)
+
+    # Prefer the uvicorn ASGI server (event loop based, scales across cores
+    # via UVICORN_WORKERS); fall back to Waitress where uvicorn/asgiref are
+    # not installed.
+    try:
+        import uvicorn
+    except ImportError:
+        uvicorn = None
+    if uvicorn is not None and asgi_app is not None:
+        workers = int(os.getenv("UVICORN_WORKERS", 2))
+        logger.info(f"Serving with uvicorn ({workers} workers)")
+        uvicorn.run("api:asgi_app", host="0.0.0.0", port=3030, workers=workers, log_level="info")
+    else:
+        from waitress import serve
+        logger.info("uvicorn not available; serving with Waitress")
+        serve(app, host="0.0.0.0", port=3030)